@@ -11,7 +11,13 @@ No comment. This library treats all years as if they had 365 days.
 """
 import datetime
 import enum
-import math
+import functools
+import operator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 
@@ -23,47 +29,87 @@ class MauvelianSeason(enum.Enum):
     COLOSSUS = 3
 
     def __str__(self):
-        if self is MauvelianSeason.ZEPHYR:
-            return "Season of Zephyr"
-        if self is MauvelianSeason.PHOENIX:
-            return "Season of Phoenix"
-        if self is MauvelianSeason.SCION:
-            return "Season of Scion"
-        if self is MauvelianSeason.COLOSSUS:
-            return "Season of Colossus"
+        return _SEASON_NAMES[self]
 
     @property
     def daysRange(self):
         """
         Return range object with numbers of days in this season.
         """
-        if self is MauvelianSeason.ZEPHYR:
-            return range(1, 91)
-        if self is MauvelianSeason.PHOENIX:
-            return range(91, 181)
-        if self is MauvelianSeason.SCION:
-            return range(181, 271)
-        if self is MauvelianSeason.COLOSSUS:
-            return range(271, 366)
+        return _DAYS_RANGES[self]
 
     @staticmethod
     def seasonOf(day_of_year):
+        try:
+            day_of_year = operator.index(day_of_year)
+        except TypeError:
+            raise TypeError("day of year must be an integer") from None
         if not 1 <= day_of_year <= 365:
             raise ValueError("day not in [1; 365] range")
-        if day_of_year <= 180:
-            if day_of_year <= 90:
-                return MauvelianSeason.ZEPHYR
-            return MauvelianSeason.PHOENIX
-        else:
-            if day_of_year <= 270:
-                return MauvelianSeason.SCION
-            return MauvelianSeason.COLOSSUS
+        return _SEASON_LUT[day_of_year]
+
+
+#Short module-level names of seasons for the tables below
+_ZEPHYR, _PHOENIX, _SCION, _COLOSSUS = MauvelianSeason
+
+#Display names of seasons
+_SEASON_NAMES = {
+    _ZEPHYR: "Season of Zephyr",
+    _PHOENIX: "Season of Phoenix",
+    _SCION: "Season of Scion",
+    _COLOSSUS: "Season of Colossus",
+}
+#Season of each day of year (index 0 is unused, days are numbered from 1)
+_SEASON_LUT = tuple([None] + [_ZEPHYR] * 90 + [_PHOENIX] * 90 + [_SCION] * 90 + [_COLOSSUS] * 95)
+#Day of season of each day of year (index 0 is unused)
+_DOS_LUT = tuple([0]
+                 + list(range(1, 91))
+                 + list(range(1, 91))
+                 + list(range(1, 91))
+                 + list(range(1, 96)))
+#First day of year of each season
+_SEASON_START = {
+    _ZEPHYR: 1,
+    _PHOENIX: 91,
+    _SCION: 181,
+    _COLOSSUS: 271,
+}
+#Days of year in each season
+_DAYS_RANGES = {
+    _ZEPHYR: range(1, 91),
+    _PHOENIX: range(91, 181),
+    _SCION: range(181, 271),
+    _COLOSSUS: range(271, 366),
+}
+#Number of days in each season
+_SEASON_LEN = {
+    _ZEPHYR: 90,
+    _PHOENIX: 90,
+    _SCION: 90,
+    _COLOSSUS: 95,
+}
+
+
+def _yearDoy(d):
+    """
+    Return (year, day of year) of given day number with single divmod.
+    """
+    if d > 0:
+        y, r = divmod(d - 1, 365)
+        return y + 1, r + 1
+    y, r = divmod(-d - 1, 365)
+    return -y - 1, r + 1
 
 
+@functools.total_ordering
 class MauvelianDate:
     """
     A date in Mauvelian Calendar (years all have 365 days, like in GW2).
+
+    Dates are hashable, but addDays modifies them in place; do not call it on a date used as dict key or in a set
+    (use date + days, which returns a new date, instead).
     """
+    __slots__ = ('_day', '_year', '_dayOfYear', '_season', '_dayOfSeason')
 
     def __init__(self, year, day, season=None):
         """
@@ -74,15 +120,22 @@ class MauvelianDate:
         assumed to be a day of this season. For example (year=1, day=95) is same as
         (year=1, day=5, season=MauvelianSeason.PHOENIX).
         """
+        #Year and day must be integers (they index lookup tables)
+        try:
+            year = operator.index(year)
+            day = operator.index(day)
+        except TypeError:
+            raise TypeError("year and day must be integers") from None
+
         #Year cannot be 0
         if year == 0:
             raise ValueError("year cannot be 0")
 
         #If season given: shift day value
         if season is not None:
-            if not 1 <= day <= len(season.daysRange):
+            if not 1 <= day <= _SEASON_LEN[season]:
                 raise ValueError("Day is not valid for this season")
-            day += season.daysRange.start - 1
+            day += _SEASON_START[season] - 1
 
         #Check day and save data
         if not 1 <= day <= 365:
@@ -90,75 +143,109 @@ class MauvelianDate:
         if year > 0:
             self._day = day + 365 * (year - 1)
         else:
-            self._day = -day - 365 * (year + 1)
+            self._day = -day + 365 * (year + 1)
+        self._updateCache()
+
+    def _updateCache(self):
+        """
+        Recompute cached year, day of year, season and day of season from _day.
+        """
+        self._year, day_of_year = _yearDoy(self._day)
+        self._dayOfYear = day_of_year
+        self._season = _SEASON_LUT[day_of_year]
+        self._dayOfSeason = _DOS_LUT[day_of_year]
+
+    @property
+    def dayNumber(self):
+        """
+        Return number of day counted from exodus; there is no day 0.
+
+        AE days count forward (1 is 1st day of 1AE, 366 is 1st day of 2AE) and BE days count outward from exodus
+        (-1 is 1st day of 1BE, -365 is 365th day of 1BE).
+        """
+        return self._day
 
     @property
     def year(self):
         """
         Return year from date (negative for years before exodus).
         """
-        if self._day > 0:
-            return math.ceil(self._day / 365)
-        return math.floor(self._day / 365)
+        return self._year
 
     @property
     def dayOfYear(self):
         """
         Return day of year from date (integer from [1; 365] range).
         """
-        d = abs(self._day % 365)
-        if d == 0:
-            return 365
-        return d
+        return self._dayOfYear
 
     @property
     def dayOfSeason(self):
         """
         Return day of season from date (integer from [1; 90] range or [1; 95] for Colossus).
         """
-        return self.dayOfYear - MauvelianSeason.seasonOf(self.dayOfYear).daysRange.start + 1
+        return self._dayOfSeason
 
     @property
     def season(self):
         """
         Return seson from date (object of MauvelianSeason enum-class).
         """
-        return MauvelianSeason.seasonOf(self.dayOfYear)
+        return self._season
 
     def __str__(self):
         if self._day > 0:
-            return "%i %s, %iAE" % (self.dayOfSeason, str(self.season), self.year)
-        return "%i %s, %iBE" % (self.dayOfSeason, str(self.season), -self.year)
+            return f"{self._dayOfSeason} {self._season!s}, {self._year}AE"
+        return f"{self._dayOfSeason} {self._season!s}, {-self._year}BE"
 
     def __lt__(self, other):
+        if not isinstance(other, MauvelianDate):
+            return NotImplemented
         return self._day < other._day
 
-    def __gt__(self, other):
-        return self._day > other._day
-
     def __eq__(self, other):
+        if not isinstance(other, MauvelianDate):
+            return NotImplemented
         return self._day == other._day
 
+    def __hash__(self):
+        return hash(self._day)
+
     def addDays(self, days):
         """
         Add given number of days to self; return (modified) self.
+
+        This changes hash of self, so it must not be called on a date used as dict key or stored in a set.
         """
-        self._day += days
-        if self._day == 0:
-            if days > 0:
-                self._day = 1
-            else:
-                self._day = 1
+        try:
+            days = operator.index(days)
+        except TypeError:
+            raise TypeError("number of days must be an integer") from None
+        #There is no day 0: moving across it needs one extra day
+        old = self._day
+        new = old + days
+        if old > 0 >= new:
+            new -= 1
+        elif old < 0 <= new:
+            new += 1
+        self._day = new
+        self._updateCache()
         return self
 
     def daysBetween(self, other):
         """
         Reuturn difference in days between this date and the other.
         """
-        return abs(self._day - other._day)
+        delta = abs(self._day - other._day)
+        if (self._day > 0) != (other._day > 0):
+            delta -= 1
+        return delta
 
     def __add__(self, days):
-        return MauvelianDate(self.year, self.dayOfYear).addDays(days)
+        #Copy without going through __init__ (no need to validate and recompute _day)
+        new = MauvelianDate.__new__(MauvelianDate)
+        new._day = self._day
+        return new.addDays(days)
 
     def __sub__(self, other):
         if isinstance(other, MauvelianDate):
@@ -167,19 +254,106 @@ class MauvelianDate:
         return self - other
 
 
+#Ordinal of numpy's datetime64 day 0
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+#Bulk conversion kernels; only ever run compiled with numba (see _loadKernels)
+def _realDaysToMauvelian(real_days, ref_real, ref_mauvelian):
+    n = real_days.shape[0]
+    out = numpy.empty(n, numpy.int64)
+    for i in range(n):
+        d = ref_mauvelian + (real_days[i] - ref_real)
+        if ref_mauvelian > 0 >= d:
+            d -= 1
+        elif ref_mauvelian < 0 <= d:
+            d += 1
+        out[i] = d
+    return out
+
+
+def _yearAndDayOfYear(day_numbers):
+    n = day_numbers.shape[0]
+    out_year = numpy.empty(n, numpy.int64)
+    out_doy = numpy.empty(n, numpy.int64)
+    for i in _prange(n):
+        y, r = _yearDoyKernel(day_numbers[i])
+        out_year[i] = y
+        out_doy[i] = r
+    return out_year, out_doy
+
+
+#Rebound to numba versions by _loadKernels before compiling the kernels
+_prange = range
+_yearDoyKernel = _yearDoy
+#None until first use, then tuple of compiled kernels or False if numba is not installed
+_kernels = None
+#Arrays at least this long are split using the parallel kernel
+_PARALLEL_THRESHOLD = 1 << 16
+
+
+def _loadKernels():
+    """
+    Return (realDaysToMauvelian, yearAndDayOfYear, yearAndDayOfYearParallel) compiled with numba, or None.
+
+    numba is imported on first call only, so that it does not slow down importing this module.
+    """
+    global _kernels, _prange, _yearDoyKernel
+    if _kernels is None:
+        try:
+            import numba
+        except ImportError:
+            _kernels = False
+        else:
+            _prange = numba.prange
+            _yearDoyKernel = numba.njit(cache=True)(_yearDoy)
+            #numba's cache key ignores the parallel flag, so only one build of _yearAndDayOfYear may be cached
+            _kernels = (numba.njit(cache=True)(_realDaysToMauvelian),
+                        numba.njit(cache=True)(_yearAndDayOfYear),
+                        numba.njit(parallel=True)(_yearAndDayOfYear))
+    return _kernels or None
+
+
+def splitDayNumbers(day_numbers):
+    """
+    Split array of Mauvelian day numbers (see MauvelianDate.dayNumber) into arrays of years and days of year.
+
+    Requires numpy; compiled with numba if it is installed.
+    """
+    if numpy is None:
+        raise ImportError("numpy is required for array conversion")
+    day_numbers = numpy.asarray(day_numbers, dtype=numpy.int64)
+    kernels = _loadKernels()
+    if kernels is not None:
+        #Kernels work on flat arrays
+        flat = day_numbers.ravel()
+        kernel = kernels[2] if flat.shape[0] >= _PARALLEL_THRESHOLD else kernels[1]
+        years, days_of_year = kernel(flat)
+        return years.reshape(day_numbers.shape), days_of_year.reshape(day_numbers.shape)
+    positive = day_numbers > 0
+    y, r = numpy.divmod(numpy.where(positive, day_numbers - 1, -day_numbers - 1), 365)
+    return numpy.where(positive, y + 1, -y - 1), r + 1
+
+
 class DateConverter:
-    _reference = (None, None)
+    __slots__ = ('_refOrdinal', '_refDay')
+
+    def __init__(self):
+        self._refOrdinal = None
+        self._refDay = None
 
     def setReferencePoint(self, real_date, mauvelian_date):
         """
         Set reference point and use it to convert between real and Mauvelian date.
 
-        real_date should be datetime.date; mauvelian_date should be MauvelianDate.
+        real_date should be datetime.date; mauvelian_date should be MauvelianDate. Pass None for both to unset it.
         """
-        if (not isinstance(real_date, datetime.date) or not isinstance(mauvelian_date, MauvelianDate)) \
-           and not (isinstance(real_date, NoneType) and isinstance(mauvelian_date, NoneType)):
+        if real_date is None and mauvelian_date is None:
+            self._refOrdinal = self._refDay = None
+        elif not (isinstance(real_date, datetime.date) and isinstance(mauvelian_date, MauvelianDate)):
             raise TypeError
-        self._reference = (real_date, mauvelian_date)
+        else:
+            self._refOrdinal = real_date.toordinal()
+            self._refDay = mauvelian_date.dayNumber
 
     def realToMauvelian(self, real_date):
         """
@@ -187,10 +361,11 @@ class DateConverter:
 
         To do this, you must set (valid) reference point firstly.
         """
-        if self._reference[0] is None or self._reference[1] is None:
+        if self._refDay is None:
             raise RuntimeError("Reference point not set")
-        delta_days = (real_date - self._reference[0]).days
-        return self._reference[1] + delta_days
+        date = MauvelianDate.__new__(MauvelianDate)
+        date._day = self._refDay
+        return date.addDays(real_date.toordinal() - self._refOrdinal)
 
     def mauvelianToReal(self, mauvelian_date):
         """
@@ -198,12 +373,55 @@ class DateConverter:
 
         To do this, you must set (valid) reference point firstly.
         """
-        if self._reference[0] is None or self._reference[1] is None:
+        if self._refDay is None:
             raise RuntimeError("Reference point not set")
-        delta_days = mauvelian_date - self._reference[1]
-        dd = mauvelian_date - self._reference[1]
-        return self._reference[0] + datetime.timedelta(days=delta_days)
-        
+        day = mauvelian_date.dayNumber
+        delta = day - self._refDay
+        #There is no day 0 between dates on opposite sides of exodus
+        if day < 0 < self._refDay:
+            delta += 1
+        elif self._refDay < 0 < day:
+            delta -= 1
+        return datetime.date.fromordinal(self._refOrdinal + delta)
+
+    def _referenceDays(self):
+        if numpy is None:
+            raise ImportError("numpy is required for array conversion")
+        if self._refDay is None:
+            raise RuntimeError("Reference point not set")
+        return self._refOrdinal - _EPOCH_ORDINAL, self._refDay
+
+    def realToMauvelianArray(self, real_dates):
+        """
+        Convert array of real dates (numpy datetime64) to array of Mauvelian day numbers (see MauvelianDate.dayNumber).
+
+        Requires numpy; to do this, you must set (valid) reference point firstly.
+        """
+        ref_real, ref_mauvelian = self._referenceDays()
+        real_days = numpy.asarray(real_dates, dtype='datetime64[D]').view(numpy.int64)
+        kernels = _loadKernels()
+        if kernels is not None:
+            return kernels[0](real_days.ravel(), ref_real, ref_mauvelian).reshape(real_days.shape)
+        days = ref_mauvelian + (real_days - ref_real)
+        if ref_mauvelian > 0:
+            return days - (days <= 0)
+        return days + (days >= 0)
+
+    def mauvelianToRealArray(self, day_numbers):
+        """
+        Convert array of Mauvelian day numbers (see MauvelianDate.dayNumber) to array of real dates (datetime64[D]).
+
+        Requires numpy; to do this, you must set (valid) reference point firstly.
+        """
+        ref_real, ref_mauvelian = self._referenceDays()
+        day_numbers = numpy.asarray(day_numbers, dtype=numpy.int64)
+        delta = day_numbers - ref_mauvelian
+        if ref_mauvelian > 0:
+            delta += day_numbers < 0
+        else:
+            delta -= day_numbers > 0
+        return (ref_real + delta).view('datetime64[D]')
+
 
 #Test
 if __name__ == "__main__":
@@ -211,11 +429,50 @@ if __name__ == "__main__":
     date1 = MauvelianDate(1306, 76, MauvelianSeason.SCION)
     #He was born in 256th day of year
     assert(date1.dayOfYear == 256)
+    assert(str(date1) == "76 Season of Scion, 1306AE")
+    assert(str(MauvelianDate(-1, 365)) == "95 Season of Colossus, 1BE")
+    assert(MauvelianSeason.seasonOf(91) is MauvelianSeason.PHOENIX)
+    try:
+        MauvelianSeason.seasonOf(5.0)
+        assert(False)
+    except TypeError:
+        pass
     date2 = MauvelianDate(1318, 128)
     assert(date1 < date2)
+    assert(date2 > date1 and date1 <= date2 and date1 != date2)
+    assert(date1 != 1306 and len({date1, date1 + 0, date2}) == 2)
     assert(date2.season == MauvelianSeason.PHOENIX)
     assert(date2.daysBetween(date1) == 365 * 11 + 109 + 128)
     assert(date1 + 365 * 11 + 109 + 128 == date2)
+    assert(MauvelianDate(-1, 365).year == -1)
+    assert(MauvelianDate(-1, 1).dayOfYear == 1)
+    assert(MauvelianDate(-1, 365).dayOfYear == 365)
+    assert(MauvelianDate(-1, 1).dayNumber == -1 and MauvelianDate(-1, 365).dayNumber == -365)
+    assert(MauvelianDate(-2, 1).dayNumber == -366 and MauvelianDate(-3, 365).dayNumber == -365 * 3)
+    assert(str(MauvelianDate(-2, 1)) == "1 Season of Zephyr, 2BE")
+    for year in (-3, -2, -1, 1, 2, 3):
+        for day in (1, 90, 91, 271, 365):
+            date = MauvelianDate(year, day)
+            assert((date.year, date.dayOfYear) == (year, day) and (date.dayNumber > 0) == (year > 0))
+            assert(date + 0 == date and MauvelianDate(date.year, date.dayOfYear) == date)
+    assert((MauvelianDate(1, 1) + -1).dayNumber == -1)
+    assert((MauvelianDate(-1, 1) + 1).dayNumber == 1)
+    assert(((MauvelianDate(-1, 1) + 1) + 1).dayNumber == (MauvelianDate(-1, 1) + 2).dayNumber == 2)
+    assert((MauvelianDate(1, 2) + -5).dayNumber == -4 and (MauvelianDate(-1, 4) + 5) == MauvelianDate(1, 2))
+    assert(MauvelianDate(1, 2).daysBetween(MauvelianDate(-1, 4)) == 5)
+    for bad in ((1, 5.0), (1.0, 5)):
+        try:
+            MauvelianDate(*bad)
+            assert(False)
+        except TypeError:
+            pass
+    try:
+        date1 + 1.0
+        assert(False)
+    except TypeError:
+        pass
+    big = MauvelianDate(2 ** 60, 365)
+    assert(big.year == 2 ** 60)
 
     #Test converter
     converter = DateConverter()
@@ -224,6 +481,66 @@ if __name__ == "__main__":
     converter.setReferencePoint(real, mauvelian)
     assert(converter.realToMauvelian(real) == mauvelian)
     assert(converter.mauvelianToReal(mauvelian) == real)
+    try:
+        converter.setReferencePoint(real, None)
+        assert(False)
+    except TypeError:
+        pass
     mauvelian2 = MauvelianDate(1328, 41, MauvelianSeason.COLOSSUS)
     converted_real = converter.mauvelianToReal(mauvelian2)
     assert(converted_real == datetime.date(2016, 11, 11))
+    unset = DateConverter()
+    unset.setReferencePoint(None, None)
+    try:
+        unset.realToMauvelian(real)
+        assert(False)
+    except RuntimeError:
+        pass
+    assert(converter.mauvelianToReal(MauvelianDate(1328, 29, MauvelianSeason.COLOSSUS)) == datetime.date(2016, 10, 30))
+    exodus = DateConverter()
+    exodus.setReferencePoint(real, MauvelianDate(1, 1))
+    for offset in range(-800, 800):
+        other_real = real + datetime.timedelta(days=offset)
+        assert(exodus.mauvelianToReal(exodus.realToMauvelian(other_real)) == other_real)
+    assert(exodus.realToMauvelian(real - datetime.timedelta(days=2)).dayNumber == -2)
+    before = DateConverter()
+    before.setReferencePoint(real, MauvelianDate(-1, 3))
+    assert(before.realToMauvelian(real + datetime.timedelta(days=5)) == MauvelianDate(1, 3))
+    assert(before.mauvelianToReal(MauvelianDate(1, 3)) == real + datetime.timedelta(days=5))
+    if numpy is not None:
+        reals = numpy.array(['2016-11-05', '2016-11-11'], dtype='datetime64[D]')
+        days = converter.realToMauvelianArray(reals)
+        assert(list(days) == [mauvelian.dayNumber, mauvelian2.dayNumber])
+        assert((converter.mauvelianToRealArray(days) == reals).all())
+        years, days_of_year = splitDayNumbers(days)
+        assert(list(years) == [1328, 1328] and list(days_of_year) == [305, 311])
+        assert(converter.realToMauvelianArray(numpy.datetime64(real)) == mauvelian.dayNumber)
+        assert(converter.mauvelianToRealArray(mauvelian.dayNumber) == numpy.datetime64(real))
+        around = numpy.datetime64(real) + numpy.arange(-800, 800)
+        for conv in (exodus, before):
+            days = conv.realToMauvelianArray(around)
+            assert(0 not in days)
+            assert(list(days) == [conv.realToMauvelian(d).dayNumber for d in around.astype(object)])
+            assert((conv.mauvelianToRealArray(days) == around).all())
+
+        #Compiled kernels (if numba is installed) and plain numpy code must give same results
+        big = numpy.arange(-2 * _PARALLEL_THRESHOLD, 2 * _PARALLEL_THRESHOLD)
+        big = big[big != 0]
+        inputs = (days, days.reshape(2, -1), numpy.int64(-5), big)
+        splits = [splitDayNumbers(x) for x in inputs]
+        conversions = [conv.realToMauvelianArray(x) for conv in (exodus, before)
+                       for x in (around, around.reshape(40, -1), numpy.datetime64(real))]
+        kernels = _loadKernels()
+        if kernels is not None:
+            overload = kernels[2].overloads[kernels[2].signatures[0]]
+            assert(overload.metadata['parfor_diagnostics'].has_setup)
+        saved_kernels, _kernels = _kernels, False
+        for x, (years, days_of_year) in zip(inputs, splits):
+            expected_years, expected_days = splitDayNumbers(x)
+            assert(numpy.array_equal(years, expected_years) and numpy.array_equal(days_of_year, expected_days))
+            assert(numpy.shape(years) == numpy.shape(x))
+        expected = [conv.realToMauvelianArray(x) for conv in (exodus, before)
+                    for x in (around, around.reshape(40, -1), numpy.datetime64(real))]
+        assert(all(numpy.array_equal(a, b) and numpy.shape(a) == numpy.shape(b)
+                   for a, b in zip(conversions, expected)))
+        _kernels = saved_kernels